@@ -1,15 +1,93 @@
 from machine import Pin, ADC, I2C
 import dht
+import gc
+import math
+import sys
 import utime
+from array import array
 from mylib2 import I2cLcd
 
+try:
+    from micropython import const
+except ImportError:
+    # CPython (tests): constants stay ordinary globals.
+    def const(value):
+        return value
+
+
+def _make_ppm(a, b):
+    # Partial evaluation: bind the curve coefficients into a closure
+    # once, so the per-tick call carries no default-argument handling,
+    # attribute lookups, or generic pow for the common b = -0.5 case.
+    if b == -0.5:
+        sqrt = math.sqrt
+
+        def ppm(ratio):
+            return a / sqrt(ratio) if ratio > 0 else 0.0
+    else:
+        def ppm(ratio):
+            if ratio <= 0:
+                return 0.0
+            estimate = a * (ratio ** b)
+            return estimate if estimate > 0 else 0.0
+    return ppm
+
+
+def _sum_rs_ohms(buf, n, vref_mv, rl):
+    # Integer Rs reduction over a raw ADC sample buffer. Pure-Python
+    # fallback; mylib3 overrides it with a native-compiled twin below.
+    total = 0
+    for i in range(n):
+        mv = (buf[i] * vref_mv) >> 16
+        if mv <= 0:
+            total += 0x7FFFFFFF
+        elif mv < vref_mv:
+            total += rl * (vref_mv - mv) // mv
+    return total
+
+
+def _ppm_q8_from_lut(lut, raw):
+    # Q8 PPM lookup with linear interpolation on the low 7 raw bits.
+    # Pure-Python fallback; mylib3 overrides it below.
+    idx = raw >> 7
+    if idx >= 511:
+        return lut[511]
+    lo = lut[idx]
+    hi = lut[idx + 1]
+    return lo + (((hi - lo) * (raw & 0x7F)) >> 7)
+
+
+try:
+    # The native emitter only engages on the literal @micropython.native
+    # decorator at compile time, so the compiled twins live in their own
+    # device-only module; builds without micropython (CPython tests) or
+    # without the emitter keep the fallbacks above.
+    from mylib3 import sum_rs_ohms as _sum_rs_ohms, ppm_q8_from_lut as _ppm_q8_from_lut
+except (ImportError, SyntaxError):
+    pass
+
 
 # ------------------- THRESHOLDS -------------------
-TEMP_THRESHOLD = 20.0       # °C
-HUMID_MIN = 70.0            # %
-METHANE_FRESH = 8           # ppm
-METHANE_EARLY = 10
-METHANE_ACTIVE = 12
+# const() lets the MicroPython compiler inline these as literals
+# instead of a globals-dict lookup per access.
+TEMP_THRESHOLD = const(20.0)    # °C
+HUMID_MIN = const(70.0)         # %
+METHANE_FRESH = const(8)        # ppm
+METHANE_EARLY = const(10)
+METHANE_ACTIVE = const(12)
+
+SHELF_LIFE_LABELS = ("5-7 Days", "3-5 Days", "1-3 Days", "0 Days")
+
+STATUS_TEMPL = "Temp: %s C, Humidity: %s %%, Methane: %.2f ppm, Shelf Life: %s\n"
+
+
+def classify_shelf_life(methane_avg):
+    # Branchless: count thresholds crossed, index the label table.
+    if methane_avg is None:
+        return "Unknown"
+    return SHELF_LIFE_LABELS[(methane_avg >= METHANE_FRESH) +
+                             (methane_avg >= METHANE_EARLY) +
+                             (methane_avg >= METHANE_ACTIVE)]
 # --------------------------------------------------
 
 
@@ -21,8 +99,16 @@ class SensorSuite:
         self.mq4_adc = ADC(Pin(mq4_adc_pin))
         self.mq4_rl = mq4_rl
         self.mq4_vref = mq4_vref
+        self.mq4_vref_mv = int(mq4_vref * 1000 + 0.5)
         self.mq4_ro_factor = mq4_ro_clean_air_factor or self.RO_CLEAN_AIR_FACTOR_DEFAULT
         self.mq4_ro = None
+        # Precomputed reciprocals: float division is far slower than a
+        # multiply on FP-div-less Cortex-M builds.
+        self._adc_scale = mq4_vref / 65535.0
+        self._inv_ro = None
+        self._ppm_lut = None
+        # Estimator specialized for the deployed curve coefficients.
+        self._ppm = _make_ppm(12.0, -0.5)
 
     def read_dht(self):
         try:
@@ -36,99 +122,187 @@ class SensorSuite:
         return self.mq4_adc.read_u16()
 
     def voltage_from_raw(self, raw):
-        return (raw / 65535.0) * self.mq4_vref
+        return raw * self._adc_scale
+
+    # ---------------- Fixed-point (integer) hot path ----------------
+    # Integer millivolts/ohms avoid boxed-float allocations per tick on
+    # softfloat MicroPython builds; floats only appear at the very end
+    # of the pipeline.
+    def voltage_mv_from_raw(self, raw):
+        return (raw * self.mq4_vref_mv) >> 16
+
+    def rs_ohms_from_mv(self, mv):
+        if mv <= 0:
+            return 0x7FFFFFFF
+        vref_mv = self.mq4_vref_mv
+        if mv >= vref_mv:
+            return 0
+        return self.mq4_rl * (vref_mv - mv) // mv
+    # ----------------------------------------------------------------
 
     def get_rs(self, voltage=None):
         if voltage is None:
             voltage = self.voltage_from_raw(self.read_mq4_raw())
         if voltage <= 0:
             return float('inf')
-        if voltage >= self.mq4_vref:
+        vref = self.mq4_vref
+        if voltage >= vref:
             return 0.0
-        return self.mq4_rl * (self.mq4_vref - voltage) / voltage
+        return self.mq4_rl * (vref - voltage) / voltage
 
     def calibrate_mq4_ro(self, samples=50, delay_ms=50):
         print("Calibrating MQ-4 Ro in clean air. Please keep sensor in fresh air.")
-        total_rs = 0
-        for _ in range(samples):
-            voltage = self.voltage_from_raw(self.read_mq4_raw())
-            total_rs += self.get_rs(voltage)
-            utime.sleep_ms(delay_ms)
+        # Capture first, crunch later: the sampling loop does nothing
+        # but read raw words into a preallocated buffer, so the pacing
+        # isn't skewed by per-sample conversion work. (The generic
+        # machine.ADC API has no DMA/timer collect; this is the closest
+        # portable equivalent.)
+        buf = array('H', bytearray(2 * samples))
+        read_u16 = self.mq4_adc.read_u16
+        sleep_ms = utime.sleep_ms
+        for i in range(samples):
+            buf[i] = read_u16()
+            sleep_ms(delay_ms)
+        total_rs = _sum_rs_ohms(buf, samples, self.mq4_vref_mv, self.mq4_rl)
         avg_rs = total_rs / samples
         self.mq4_ro = avg_rs / self.mq4_ro_factor
+        self._inv_ro = 1.0 / self.mq4_ro if self.mq4_ro else 0.0
+        self._build_ppm_lut()
         print(f"Calibration finished: Ro = {self.mq4_ro:.2f} ohms")
         return self.mq4_ro
 
+    def _build_ppm_lut(self):
+        # With vref, RL and Ro fixed after calibration, PPM is a pure
+        # function of the 16-bit ADC reading. Tabulate it once as Q8
+        # over the top 9 raw bits; read_all then does a table lookup
+        # plus one linear interpolation instead of the float pipeline.
+        lut = array('H', bytearray(2 * 512))
+        inv_ro = self._inv_ro
+        estimate = self._ppm
+        for i in range(512):
+            mv = self.voltage_mv_from_raw(i << 7)
+            ratio = self.rs_ohms_from_mv(mv) * inv_ro
+            q8 = int(estimate(ratio) * 256 + 0.5)
+            lut[i] = 65535 if q8 > 65535 else q8
+        self._ppm_lut = lut
+
+    def _ppm_from_lut(self, raw):
+        return _ppm_q8_from_lut(self._ppm_lut, raw) * 0.00390625  # 1/256
+
     def read_mq4_ratio(self):
         if self.mq4_ro is None:
             raise RuntimeError("MQ-4 Ro not calibrated; call calibrate_mq4_ro() first.")
-        voltage = self.voltage_from_raw(self.read_mq4_raw())
-        rs = self.get_rs(voltage)
-        return rs / self.mq4_ro if self.mq4_ro != 0 else float('inf')
+        if self._inv_ro is None:
+            # Ro was set directly rather than via calibrate_mq4_ro().
+            self._inv_ro = 1.0 / self.mq4_ro if self.mq4_ro else 0.0
+        if self._inv_ro == 0.0:
+            return float('inf')
+        rs = self.rs_ohms_from_mv(self.voltage_mv_from_raw(self.read_mq4_raw()))
+        return rs * self._inv_ro
 
     # ---------------- Adjusted methane estimation ----------------
     def estimate_methane_ppm(self, ratio, a=12, b=-0.5):
         """
         Adjusted for low ppm detection (~10-12 ppm)
+
+        The deployed coefficients use the specialized closure built in
+        __init__; other coefficients build a one-off closure.
         """
-        try:
-            ppm = a * (ratio ** b)
-            return max(ppm, 0)
-        except Exception:
-            return None
+        if a == 12 and b == -0.5:
+            return self._ppm(ratio)
+        return _make_ppm(a, b)(ratio)
 
     def read_all(self):
         temp, humid = self.read_dht()
         methane_ppm = None
         try:
-            ratio = self.read_mq4_ratio()
-            methane_ppm = self.estimate_methane_ppm(ratio)
+            if self._ppm_lut is not None:
+                methane_ppm = self._ppm_from_lut(self.read_mq4_raw())
+            else:
+                methane_ppm = self._ppm(self.read_mq4_ratio())
         except Exception as e:
             print("MQ-4 read error:", e)
         return temp, humid, methane_ppm
 
 
 class BananaLcdDisplay:
+    # Shared line templates: built once, reused every refresh.
+    _FMT_TEMP = "Temp: %.1fC"
+    _FMT_HUMID = "Humidity: %d%%"
+    _FMT_METHANE = "Methane: %.2fppm"
+
     def __init__(self, i2c, address=0x27):
         self.lcd = I2cLcd(i2c, address, 2, 16)
         self.current_screen = 0
+        # Front buffer: the 32 characters currently on the panel.
+        # Refreshes diff against it and write only changed cells.
+        self._front = bytearray(b" " * 32)
+        # Reusable padded-line buffers so each update formats in place
+        # instead of allocating fresh 16-char strings.
+        self._line_bufs = (bytearray(b" " * 16), bytearray(b" " * 16))
 
     # ---------------- SAFE PADDING ----------------
-    def pad(self, text, length=16):
-        text = str(text)
-        if len(text) < length:
-            return text + (" " * (length - len(text)))
-        return text[:length]
+    def _pad_into(self, buf, text):
+        n = len(text)
+        if n > 16:
+            n = 16
+        for i in range(n):
+            buf[i] = ord(text[i])
+        for i in range(n, 16):
+            buf[i] = 0x20
+        return buf
     # ----------------------------------------------
 
+    def _push(self, line0, line1):
+        # Diff each line against the front buffer and write only the
+        # runs of changed cells, one burst per run; an unchanged frame
+        # costs no bus traffic and clear() is never needed. Lines are
+        # already padded to the full width.
+        front = self._front
+        lcd = self.lcd
+        write_at = getattr(lcd, "write_at", None)
+        for row, line in ((0, line0), (1, line1)):
+            base = row * 16
+            i = 0
+            while i < 16:
+                if line[i] == front[base + i]:
+                    i += 1
+                    continue
+                start = i
+                while i < 16 and line[i] != front[base + i]:
+                    i += 1
+                run = line[start:i]
+                if write_at is not None:
+                    write_at(start, row, run)
+                else:
+                    # putstr iterates characters, so hand it a str, not
+                    # a bytearray of ints.
+                    lcd.move_to(start, row)
+                    lcd.putstr(bytes(run).decode())
+            front[base:base + 16] = line
+
     def display_screen_1(self, temperature, humidity):
-        self.lcd.clear()
-        try:
-            temp_str = f"Temp: {float(temperature):.1f}C"
-        except Exception:
+        # DHT11 readings are already numeric; a None check is the only
+        # validation the hot path needs.
+        if temperature is None:
             temp_str = "Temp: N/A"
-        try:
-            humid_val = int(float(humidity))
-            humid_str = f"Humidity: {humid_val}%"
-        except Exception:
+        else:
+            temp_str = self._FMT_TEMP % temperature
+        if humidity is None:
             humid_str = "Humidity: N/A"
-        self.lcd.move_to(0, 0)
-        self.lcd.putstr(self.pad(temp_str))
-        self.lcd.move_to(0, 1)
-        self.lcd.putstr(self.pad(humid_str))
+        else:
+            humid_str = self._FMT_HUMID % humidity
+        self._push(self._pad_into(self._line_bufs[0], temp_str),
+                   self._pad_into(self._line_bufs[1], humid_str))
 
     def display_screen_2(self, methane, shelf_life):
-        self.lcd.clear()
-        try:
-            methane_val = float(methane)
-            methane_str = f"Methane: {methane_val:.2f}ppm"
-        except Exception:
+        if methane is None:
             methane_str = "Methane: N/A"
+        else:
+            methane_str = self._FMT_METHANE % methane
         shelf_str = str(shelf_life) if shelf_life is not None else "Shelf Life: N/A"
-        self.lcd.move_to(0, 0)
-        self.lcd.putstr(self.pad(methane_str))
-        self.lcd.move_to(0, 1)
-        self.lcd.putstr(self.pad(shelf_str))
+        self._push(self._pad_into(self._line_bufs[0], methane_str),
+                   self._pad_into(self._line_bufs[1], shelf_str))
 
     def update(self, temperature, humidity, methane, shelf_life):
         if self.current_screen == 0:
@@ -147,42 +321,66 @@ if __name__ == "__main__":
     sensors.calibrate_mq4_ro()
     print("Starting sensor readings and LCD display (Ctrl+C to stop)...")
 
-    methane_history = []
+    # Single-pole IIR smoother: comparable damping to the old 5-sample
+    # moving average with no buffer at all, one multiply-add per tick.
+    METHANE_ALPHA = 0.3
+    methane_filt = None
+
+    # Hoist hot lookups into locals: local slots beat global/attribute
+    # dict lookups in the per-tick bytecode.
+    read_all = sensors.read_all
+    update = display.update
+    classify = classify_shelf_life
+    write = sys.stdout.write
+    collect = gc.collect
+
+    # Absolute-deadline scheduling: sleep only the remainder of each
+    # 3 s period so the cadence doesn't drift with workload, and spend
+    # the idle gap in lightsleep where the port provides it.
+    PERIOD_MS = 3000
+    ticks_ms = utime.ticks_ms
+    ticks_add = utime.ticks_add
+    ticks_diff = utime.ticks_diff
+    try:
+        from machine import lightsleep as idle
+    except ImportError:
+        idle = utime.sleep_ms
+    next_t = ticks_add(ticks_ms(), PERIOD_MS)
 
     try:
         while True:
-            temp, humidity, methane = sensors.read_all()
-            temp_val = float(temp) if temp is not None else None
-            humid_val = int(float(humidity)) if humidity is not None else None
+            # DHT11 temperature()/humidity() already return ints; no
+            # per-tick float()/int() re-coercion needed.
+            temp, humidity, methane = read_all()
 
             # ---------------- Smooth methane readings ----------------
             if methane is not None:
-                methane_history.append(methane)
-                if len(methane_history) > 5:
-                    methane_history.pop(0)
-                methane_avg = sum(methane_history) / len(methane_history)
+                if methane_filt is None:
+                    methane_filt = methane
+                else:
+                    methane_filt += METHANE_ALPHA * (methane - methane_filt)
+                methane_avg = methane_filt
             else:
                 methane_avg = None
             # ---------------------------------------------------------
 
             # ----------------- Threshold-based shelf life -----------------
-            if methane_avg is None:
-                shelf_life = "Unknown"
-            elif methane_avg < METHANE_FRESH:
-                shelf_life = "5-7 Days"
-            elif methane_avg < METHANE_EARLY:
-                shelf_life = "3-5 Days"
-            elif methane_avg < METHANE_ACTIVE:
-                shelf_life = "1-3 Days"
-            else:
-                shelf_life = "0 Days"
+            shelf_life = classify(methane_avg)
             # ----------------------------------------------------------------
 
-            print(f"Temp: {temp_val} C, Humidity: {humid_val} %, Methane: {methane_avg:.2f} ppm, Shelf Life: {shelf_life}")
+            write(STATUS_TEMPL %
+                  (temp, humidity, methane_avg or 0.0, shelf_life))
+
+            update(temp, humidity, methane_avg or 0, shelf_life)
 
-            display.update(temp_val, humid_val, methane_avg or 0, shelf_life)
+            # Collect at a known-idle point each cycle rather than
+            # letting the GC fire mid-measurement.
+            collect()
 
-            utime.sleep(3)
+            dt = ticks_diff(next_t, ticks_ms())
+            if dt > 0:
+                idle(dt)
+            next_t = ticks_add(next_t, PERIOD_MS)
 
     except KeyboardInterrupt:
         print("\nStopped by user.")
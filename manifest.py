@@ -0,0 +1,14 @@
+# MicroPython freeze manifest. Build the firmware with
+#
+#   make FROZEN_MANIFEST=/path/to/BANANAIQ/manifest.py
+#
+# from the port directory so these modules are compiled into flash as
+# frozen bytecode: no parse/compile at import and the bytecode executes
+# from ROM instead of eating several KB of heap. Run the app on the
+# board with `import main`.
+include("$(PORT_DIR)/boards/manifest.py")
+
+module("mylib.py")
+module("mylib2.py")
+module("mylib3.py")
+module("main.py")
@@ -33,8 +33,7 @@ class I2cLcd(LcdApi):
 
     def hal_write_init_nibble(self, nibble):
         byte = ((nibble >> 4) & 0x0F) << SHIFT_DATA
-        self.i2c.writeto(self.i2c_addr, bytes([byte | MASK_E]))
-        self.i2c.writeto(self.i2c_addr, bytes([byte]))
+        self.i2c.writeto(self.i2c_addr, bytes([byte | MASK_E, byte]))
         gc.collect()
 
     def hal_backlight_on(self):
@@ -46,27 +45,57 @@ class I2cLcd(LcdApi):
         gc.collect()
 
     def hal_write_command(self, cmd):
-        byte = ((self.backlight << SHIFT_BACKLIGHT) |
-                (((cmd >> 4) & 0x0F) << SHIFT_DATA))
-        self.i2c.writeto(self.i2c_addr, bytes([byte | MASK_E]))
-        self.i2c.writeto(self.i2c_addr, bytes([byte]))
-        byte = ((self.backlight << SHIFT_BACKLIGHT) |
-                ((cmd & 0x0F) << SHIFT_DATA))
-        self.i2c.writeto(self.i2c_addr, bytes([byte | MASK_E]))
-        self.i2c.writeto(self.i2c_addr, bytes([byte]))
+        # Both nibbles in one transaction: one address phase instead of
+        # four separate writeto() calls.
+        bl = self.backlight << SHIFT_BACKLIGHT
+        hi = bl | (((cmd >> 4) & 0x0F) << SHIFT_DATA)
+        lo = bl | ((cmd & 0x0F) << SHIFT_DATA)
+        self.i2c.writeto(self.i2c_addr,
+                         bytes([hi | MASK_E, hi, lo | MASK_E, lo]))
         if cmd <= 3:
             utime.sleep_ms(5)
         gc.collect()
 
+    def _append_cmd_nibbles(self, buf, cmd):
+        bl = self.backlight << SHIFT_BACKLIGHT
+        hi = bl | (((cmd >> 4) & 0x0F) << SHIFT_DATA)
+        lo = bl | ((cmd & 0x0F) << SHIFT_DATA)
+        buf.append(hi | MASK_E)
+        buf.append(hi)
+        buf.append(lo | MASK_E)
+        buf.append(lo)
+
+    def _append_data_nibbles(self, buf, data):
+        bl = MASK_RS | (self.backlight << SHIFT_BACKLIGHT)
+        for char in data:
+            byte = char if isinstance(char, int) else ord(char)
+            hi = bl | (((byte >> 4) & 0x0F) << SHIFT_DATA)
+            lo = bl | ((byte & 0x0F) << SHIFT_DATA)
+            buf.append(hi | MASK_E)
+            buf.append(hi)
+            buf.append(lo | MASK_E)
+            buf.append(lo)
+
+    def write_at(self, cursor_x, cursor_y, data):
+        # Set the DDRAM address and stream a run of data bytes in one
+        # I2C transaction; used for partial (diffed) refreshes.
+        addr = cursor_x & 0x3F
+        if cursor_y & 1:
+            addr += 0x40
+        if cursor_y & 2:
+            addr += self.num_columns
+        buf = bytearray()
+        self._append_cmd_nibbles(buf, self.LCD_DDRAM | addr)
+        self._append_data_nibbles(buf, data)
+        self.i2c.writeto(self.i2c_addr, buf)
+        self.cursor_x = cursor_x + len(data)
+        self.cursor_y = cursor_y
+        gc.collect()
+
     def hal_write_data(self, data):
-        byte = (MASK_RS |
-                (self.backlight << SHIFT_BACKLIGHT) |
-                (((data >> 4) & 0x0F) << SHIFT_DATA))
-        self.i2c.writeto(self.i2c_addr, bytes([byte | MASK_E]))
-        self.i2c.writeto(self.i2c_addr, bytes([byte]))
-        byte = (MASK_RS |
-                (self.backlight << SHIFT_BACKLIGHT) |
-                ((data & 0x0F) << SHIFT_DATA))
-        self.i2c.writeto(self.i2c_addr, bytes([byte | MASK_E]))
-        self.i2c.writeto(self.i2c_addr, bytes([byte]))
+        bl = MASK_RS | (self.backlight << SHIFT_BACKLIGHT)
+        hi = bl | (((data >> 4) & 0x0F) << SHIFT_DATA)
+        lo = bl | ((data & 0x0F) << SHIFT_DATA)
+        self.i2c.writeto(self.i2c_addr,
+                         bytes([hi | MASK_E, hi, lo | MASK_E, lo]))
         gc.collect()
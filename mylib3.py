@@ -0,0 +1,30 @@
+# Native-compiled hot paths. The emitter is engaged only by the literal
+# @micropython.native decorator at compile time, so these twins of the
+# pure-Python fallbacks in main.py live in their own module; main
+# imports them under try/except and keeps its fallbacks on builds
+# without micropython or without the emitter.
+import micropython
+
+
+@micropython.native
+def sum_rs_ohms(buf, n, vref_mv, rl):
+    # Integer Rs reduction over a raw ADC sample buffer.
+    total = 0
+    for i in range(n):
+        mv = (buf[i] * vref_mv) >> 16
+        if mv <= 0:
+            total += 0x7FFFFFFF
+        elif mv < vref_mv:
+            total += rl * (vref_mv - mv) // mv
+    return total
+
+
+@micropython.native
+def ppm_q8_from_lut(lut, raw):
+    # Q8 PPM lookup with linear interpolation on the low 7 raw bits.
+    idx = raw >> 7
+    if idx >= 511:
+        return lut[511]
+    lo = lut[idx]
+    hi = lut[idx + 1]
+    return lo + (((hi - lo) * (raw & 0x7F)) >> 7)
@@ -2,13 +2,15 @@ import sys
 import unittest
 from unittest.mock import MagicMock, patch
 
+import numpy as np
+
 # -------------------- PATCH MICRO-PYTHON MODULES --------------------
 sys.modules['machine'] = MagicMock()
 sys.modules['dht'] = MagicMock()
 sys.modules['utime'] = MagicMock()
 
 # -------------------- IMPORT YOUR CODE AFTER PATCH --------------------
-from main import SensorSuite, BananaLcdDisplay
+from main import SensorSuite, BananaLcdDisplay, classify_shelf_life
 
 # -------------------- MOCK CLASSES --------------------
 class MockADC:
@@ -69,43 +71,25 @@ class TestBananaMonitor(unittest.TestCase):
 
     # -------------------- SHELF-LIFE TEST --------------------
     def test_shelf_life_logic(self):
-        # Simulate different methane levels
-        test_values = [
-            (5, "5-7 Days"),
-            (9, "3-5 Days"),
-            (11, "1-3 Days"),
-            (13, "0 Days"),
-        ]
-        for methane_raw, expected in test_values:
-            shelf_life = self.calculate_shelf_life(methane_raw)
-            self.assertIn(expected, shelf_life)
-
-    def calculate_shelf_life(self, methane):
-        TEMP_THRESHOLD = 20.0
-        HUMID_MIN = 70.0
-        METHANE_FRESH = 8
-        METHANE_EARLY = 10
-        METHANE_ACTIVE = 12
-
-        shelf_life = "Unknown"
-        if methane < METHANE_FRESH:
-            shelf_life = "5-7 Days"
-        elif methane < METHANE_EARLY:
-            shelf_life = "3-5 Days"
-        elif methane < METHANE_ACTIVE:
-            shelf_life = "1-3 Days"
-        else:
-            shelf_life = "0 Days"
-
-        # Environmental adjustment
-        temp_val = 25
-        humid_val = 80
-        if temp_val > TEMP_THRESHOLD:
-            shelf_life += " (High Temp)"
-        if humid_val < HUMID_MIN:
-            shelf_life += " (Low Humid)"
-
-        return shelf_life
+        # Vectorized sweep: one C-level searchsorted classifies every
+        # methane value instead of a Python branch chain per sample.
+        thresholds = np.array([8, 10, 12])
+        labels = np.array(["5-7 Days", "3-5 Days", "1-3 Days", "0 Days"])
+
+        # Original fixtures
+        vals = np.array([5.0, 9.0, 11.0, 13.0])
+        out = labels[np.searchsorted(thresholds, vals, side='right')]
+        np.testing.assert_array_equal(out, labels)
+
+        # Dense sweep: the vectorized classifier must agree with the
+        # scalar classify_shelf_life from main, boundaries included.
+        sweep = np.concatenate([
+            np.linspace(0.0, 20.0, 100001),
+            thresholds.astype(float),
+        ])
+        out = labels[np.searchsorted(thresholds, sweep, side='right')]
+        expected = np.array([classify_shelf_life(float(v)) for v in sweep])
+        np.testing.assert_array_equal(out, expected)
 
     # -------------------- LCD DISPLAY TEST --------------------
     def test_display_update(self):